@@ -7,11 +7,11 @@ em formato STL, centralizado no ponto (0, 0, 0).
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pydicom
 from skimage import measure
-import trimesh
-from matplotlib.path import Path
+from numba import njit, prange
 
 
 def load_rtstruct(rtstruct_path: str) -> pydicom.dataset.FileDataset:
@@ -38,6 +38,244 @@ def get_structure_names(rtstruct: pydicom.dataset.FileDataset) -> list[str]:
     return [roi.ROIName for roi in rtstruct.StructureSetROISequence]
 
 
+def get_structure_contours(rtstruct: pydicom.dataset.FileDataset, structure_name: str) -> list[np.ndarray]:
+    """Lê os contornos (ContourData) de uma estrutura do RTSTRUCT.
+
+    Parâmetros:
+        rtstruct (FileDataset): Arquivo RTSTRUCT carregado.
+        structure_name (str): Nome da estrutura (ROI), sem diferenciar maiúsculas e minúsculas.
+
+    Retorna:
+        list[np.ndarray]: Pontos (N, 3) de cada contorno, em coordenadas do paciente (mm).
+    """
+    # Índices das estruturas: nome → número da ROI (primeira ocorrência) e número → contornos
+    # (todos os itens de ROIContourSequence que referenciam a mesma ROI são reunidos)
+    name_to_number = {roi.ROIName.lower(): roi.ROINumber for roi in reversed(rtstruct.StructureSetROISequence)}
+    contours_by_roi = {}
+    for rc in rtstruct.ROIContourSequence:
+        contours_by_roi.setdefault(rc.ReferencedROINumber, []).extend(rc.get('ContourSequence', []))
+    structure_index = name_to_number.get(structure_name.lower())
+    if structure_index is None:
+        raise ValueError(f"Estrutura '{structure_name}' não encontrada no RTSTRUCT.")
+
+    contours = []
+    for contour in contours_by_roi.get(structure_index, []):
+        contour_data = contour['ContourData'].value
+        contours.append(np.fromiter(contour_data, dtype=np.float64, count=len(contour_data)).reshape(-1, 3))
+    return contours
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _fill_contours(mask_slice: np.ndarray, pts_xy: np.ndarray, starts: np.ndarray,
+                   origin_xy: np.ndarray, spacing_xy: np.ndarray, row0: int = 0, col0: int = 0) -> None:
+    """Preenche na fatia da máscara os pixels internos aos contornos fechados de uma fatia.
+
+    Os contornos chegam concatenados em um único vetor de vértices e a fatia recebe a
+    união de todos eles. O preenchimento é feito por linhas de varredura, apenas nas
+    linhas da caixa delimitadora dos contornos, em paralelo entre as linhas. A fatia
+    pode ser um recorte da imagem cujo primeiro pixel é (row0, col0).
+
+    Parâmetros:
+        mask_slice (np.ndarray): Fatia da máscara (linhas, colunas), alterada no local.
+        pts_xy (np.ndarray): Vértices dos contornos (N, 2) em coordenadas do paciente (mm).
+        starts (np.ndarray): Índice do primeiro vértice de cada contorno, seguido de N.
+        origin_xy (np.ndarray): Posição (x, y) do primeiro pixel da imagem (mm).
+        spacing_xy (np.ndarray): Espaçamento dos pixels em x e y (mm).
+        row0 (int): Linha da imagem correspondente à primeira linha da fatia (padrão: 0).
+        col0 (int): Coluna da imagem correspondente à primeira coluna da fatia (padrão: 0).
+    """
+    n_rows, n_cols = mask_slice.shape
+    max_contour_pts = np.max(starts[1:] - starts[:-1])
+    cols = (pts_xy[:, 0] - origin_xy[0]) / spacing_xy[0]
+    rows = (pts_xy[:, 1] - origin_xy[1]) / spacing_xy[1]
+
+    # Índices de linha e coluna permanecem os da imagem; o recorte só é aplicado na escrita
+    r0 = max(int(np.floor(rows.min())), row0)
+    r1 = min(int(np.ceil(rows.max())), row0 + n_rows - 1)
+    for y in prange(r0, r1 + 1):
+        # Buffer de interseções da linha, reutilizado entre os contornos (dimensionado pelo maior)
+        xs = np.empty(max_contour_pts)
+        for s in range(starts.shape[0] - 1):
+            start, end = starts[s], starts[s + 1]
+            # Interseções da linha y com as arestas (y0 < y <= y1) do contorno s
+            n_xs = 0
+            for i in range(start, end):
+                j = i - 1 if i > start else end - 1
+                y0, x0 = rows[j], cols[j]
+                y1, x1 = rows[i], cols[i]
+                if y0 > y1:
+                    y0, y1, x0, x1 = y1, y0, x1, x0
+                if y0 < y <= y1:
+                    xs[n_xs] = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+                    n_xs += 1
+
+            xs[:n_xs].sort()
+            # Cada par de interseções define um trecho contíguo da linha, marcado de uma vez;
+            # como só são escritos valores True, contornos sobrepostos resultam na união
+            for k in range(0, n_xs - 1, 2):
+                c0 = max(int(np.ceil(xs[k])), col0)
+                c1 = min(int(np.floor(xs[k + 1])) + 1, col0 + n_cols)
+                if c0 < c1:
+                    mask_slice[y - row0, c0 - col0:c1 - col0] = True
+
+
+@njit(cache=True)
+def _stitch_band(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """Triangula a faixa entre dois contornos de cortes adjacentes (tiling pela menor diagonal).
+
+    Parâmetros:
+        lower (np.ndarray): Contorno inferior (N, 3), em sentido anti-horário.
+        upper (np.ndarray): Contorno superior (M, 3), no mesmo sentido e iniciando no vértice
+            mais próximo do início do contorno inferior.
+
+    Retorna:
+        np.ndarray: Triângulos (N + M, 3); índices 0..N-1 referem-se ao contorno inferior e
+        N..N+M-1 ao superior.
+    """
+    n, m = lower.shape[0], upper.shape[0]
+    faces = np.empty((n + m, 3), dtype=np.int64)
+    i = j = 0
+    for k in range(n + m):
+        a0, a1 = i % n, (i + 1) % n
+        b0, b1 = j % m, (j + 1) % m
+        advance_lower = j == m
+        if i < n and j < m:
+            # Avança no contorno cuja nova diagonal for mais curta
+            d_lower = np.sum((lower[a1] - upper[b0]) ** 2)
+            d_upper = np.sum((lower[a0] - upper[b1]) ** 2)
+            advance_lower = d_lower <= d_upper
+        if advance_lower:
+            faces[k, 0], faces[k, 1], faces[k, 2] = a0, a1, n + b0
+            i += 1
+        else:
+            faces[k, 0], faces[k, 1], faces[k, 2] = a0, n + b1, n + b0
+            j += 1
+    return faces
+
+
+def read_ct_geometry(ct_folder: str) -> tuple[np.ndarray, list[float], float, np.ndarray, tuple[int, int]]:
+    """Lê os cabeçalhos das imagens de CT e obtém a geometria da série.
+
+    Parâmetros:
+        ct_folder (str): Pasta contendo os arquivos DICOM das imagens de CT.
+
+    Retorna:
+        tuple[np.ndarray, list[float], float, np.ndarray, tuple[int, int]]:
+            - Posições z dos cortes, em ordem crescente (mm)
+            - Espaçamento dos pixels (mm)
+            - Espessura dos cortes (mm)
+            - Posição (x, y) do primeiro pixel da imagem (mm)
+            - Dimensões da imagem (linhas, colunas)
+    """
+    # Leitura (em paralelo) e ordenação das fatias da tomografia; apenas o cabeçalho é necessário
+    with os.scandir(ct_folder) as entries:
+        ct_paths = [entry.path for entry in entries if entry.is_file() and entry.name.endswith('.dcm')]
+    if len(ct_paths) < 2:
+        raise ValueError(f"A pasta '{ct_folder}' deve conter ao menos dois arquivos DICOM de CT.")
+    header_tags = ['ImagePositionPatient', 'PixelSpacing', 'Rows', 'Columns']
+    with ThreadPoolExecutor(max_workers=min(16, len(ct_paths))) as executor:
+        slices = list(executor.map(
+            lambda path: pydicom.dcmread(path, stop_before_pixels=True, specific_tags=header_tags), ct_paths
+        ))
+    z_positions = np.fromiter((float(s.ImagePositionPatient[2]) for s in slices), dtype=np.float64,
+                              count=len(slices))
+    order = np.argsort(z_positions, kind='stable')
+    z_positions = z_positions[order]
+    first_slice = slices[order[0]]
+
+    pixel_spacing = first_slice.PixelSpacing
+    slice_thickness = abs(z_positions[1] - z_positions[0])
+    origin_xy = np.array([float(first_slice.ImagePositionPatient[0]), float(first_slice.ImagePositionPatient[1])])
+    return z_positions, pixel_spacing, slice_thickness, origin_xy, (int(first_slice.Rows), int(first_slice.Columns))
+
+
+def filter_contours_to_ct(contours: list[np.ndarray], ct_geometry: tuple) -> list[np.ndarray]:
+    """Descarta os contornos que estão fora da extensão da tomografia.
+
+    São descartados os contornos com z a mais de meia espessura de corte além dos cortes
+    extremos e aqueles cuja caixa delimitadora (x, y) não alcança a grade da imagem.
+
+    Parâmetros:
+        contours (list[np.ndarray]): Contornos (N, 3) em coordenadas do paciente (mm).
+        ct_geometry (tuple): Geometria da série de CT, como retornada por read_ct_geometry.
+
+    Retorna:
+        list[np.ndarray]: Contornos dentro da extensão da tomografia.
+    """
+    z_positions, pixel_spacing, slice_thickness, (ox, oy), (rows, cols) = ct_geometry
+    z_min, z_max = z_positions[0] - slice_thickness / 2, z_positions[-1] + slice_thickness / 2
+    x_max, y_max = ox + (cols - 1) * float(pixel_spacing[0]), oy + (rows - 1) * float(pixel_spacing[1])
+
+    selected = []
+    for pts in contours:
+        if not z_min <= pts[0, 2] <= z_max:
+            continue
+        x, y = pts[:, 0], pts[:, 1]
+        if x.max() < ox or x.min() > x_max or y.max() < oy or y.min() > y_max:
+            continue
+        selected.append(pts)
+    return selected
+
+
+def contours_to_mask(contours: list[np.ndarray], ct_geometry: tuple,
+                     crop: bool = False) -> tuple[np.ndarray, tuple[int, int, int]]:
+    """Rasteriza contornos em uma máscara binária 3D alinhada com a tomografia.
+
+    Com crop=True a máscara cobre apenas a caixa delimitadora dos contornos (com margem de
+    1 voxel, limitada à imagem), sem alocar nem percorrer o volume completo da tomografia.
+
+    Parâmetros:
+        contours (list[np.ndarray]): Contornos (N, 3) em coordenadas do paciente (mm), já
+            restritos à extensão da tomografia (filter_contours_to_ct).
+        ct_geometry (tuple): Geometria da série de CT, como retornada por read_ct_geometry.
+        crop (bool): Se True, recorta a máscara à caixa delimitadora dos contornos (padrão: False).
+
+    Retorna:
+        tuple[np.ndarray, tuple[int, int, int]]:
+            - Máscara binária 3D (z, y, x)
+            - Índice (fatia, linha, coluna) do volume correspondente ao voxel [0, 0, 0] da máscara
+    """
+    z_positions, pixel_spacing, slice_thickness, origin_xy, (rows, cols) = ct_geometry
+    spacing_xy = np.array([float(pixel_spacing[0]), float(pixel_spacing[1])])
+
+    # Com cortes igualmente espaçados, o índice da fatia é obtido diretamente a partir de z
+    z_first, n_slices = z_positions[0], len(z_positions)
+    uniform_z = slice_thickness > 0 and np.allclose(np.diff(z_positions), slice_thickness)
+
+    # Agrupamento dos contornos por fatia da tomografia
+    contours_by_slice = {}
+    for pts in contours:
+        z = pts[0, 2]
+        if uniform_z:
+            # Empates no ponto médio entre dois cortes ficam com o corte inferior, como em argmin
+            slice_idx = min(max(int(np.ceil((z - z_first) / slice_thickness - 0.5)), 0), n_slices - 1)
+        else:
+            slice_idx = np.argmin(np.abs(z_positions - z))
+        contours_by_slice.setdefault(slice_idx, []).append(pts[:, :2])
+
+    # Caixa delimitadora dos contornos em índices do volume, com margem de 1 voxel
+    if crop:
+        if not contours:
+            raise ValueError("A máscara da estrutura está vazia.")
+        xy_min = np.min([pts[:, :2].min(axis=0) for pts in contours], axis=0)
+        xy_max = np.max([pts[:, :2].max(axis=0) for pts in contours], axis=0)
+        (c_min, r_min), (c_max, r_max) = (xy_min - origin_xy) / spacing_xy, (xy_max - origin_xy) / spacing_xy
+        k0, k1 = max(min(contours_by_slice) - 1, 0), min(max(contours_by_slice) + 1, n_slices - 1)
+        r0, r1 = max(int(np.floor(r_min)) - 1, 0), min(int(np.ceil(r_max)) + 1, rows - 1)
+        c0, c1 = max(int(np.floor(c_min)) - 1, 0), min(int(np.ceil(c_max)) + 1, cols - 1)
+    else:
+        k0, k1, r0, r1, c0, c1 = 0, n_slices - 1, 0, rows - 1, 0, cols - 1
+    mask = np.zeros((k1 - k0 + 1, r1 - r0 + 1, c1 - c0 + 1), dtype=bool)
+
+    # Construção da máscara fatia a fatia, com todos os contornos da fatia em uma única chamada
+    for slice_idx, slice_contours in contours_by_slice.items():
+        pts_xy = np.concatenate(slice_contours)
+        starts = np.cumsum([0] + [len(c) for c in slice_contours])
+        _fill_contours(mask[slice_idx - k0], pts_xy, starts, origin_xy, spacing_xy, r0, c0)
+
+    return mask, (k0, r0, c0)
+
+
 def extract_structure_mask(rtstruct: pydicom.dataset.FileDataset, ct_folder: str, structure_name: str):
     """Constrói uma máscara binária 3D para a estrutura especificada.
 
@@ -55,48 +293,39 @@ def extract_structure_mask(rtstruct: pydicom.dataset.FileDataset, ct_folder: str
             - Espaçamento dos pixels (mm)
             - Espessura dos cortes (mm)
     """
-    # Leitura e ordenação das fatias da tomografia
-    slices = [pydicom.dcmread(os.path.join(ct_folder, f)) for f in os.listdir(ct_folder) if f.endswith('.dcm')]
-    slices.sort(key=lambda s: s.ImagePositionPatient[2])
-    z_positions = np.array([s.ImagePositionPatient[2] for s in slices])
-
-    pixel_spacing = slices[0].PixelSpacing
-    slice_thickness = abs(slices[1].ImagePositionPatient[2] - slices[0].ImagePositionPatient[2])
-    shape = (len(slices), slices[0].Rows, slices[0].Columns)
-    mask = np.zeros(shape, dtype=np.uint8)
-
-    # Identificar índice da estrutura
-    structure_index = None
-    for roi in rtstruct.StructureSetROISequence:
-        if roi.ROIName.lower() == structure_name.lower():
-            structure_index = roi.ROINumber
-            break
-    if structure_index is None:
-        raise ValueError(f"Estrutura '{structure_name}' não encontrada no RTSTRUCT.")
-
-    # Construção da máscara voxel a voxel
-    for roi_contour in rtstruct.ROIContourSequence:
-        if roi_contour.ReferencedROINumber == structure_index:
-            for contour in roi_contour.ContourSequence:
-                pts = np.array(contour.ContourData).reshape(-1, 3)
-                z = pts[0, 2]
-                slice_idx = np.argmin(np.abs(z_positions - z))
-
-                row_coords = (pts[:, 1] - slices[0].ImagePositionPatient[1]) / pixel_spacing[1]
-                col_coords = (pts[:, 0] - slices[0].ImagePositionPatient[0]) / pixel_spacing[0]
+    ct_geometry = read_ct_geometry(ct_folder)
+    contours = filter_contours_to_ct(get_structure_contours(rtstruct, structure_name), ct_geometry)
+    mask, _ = contours_to_mask(contours, ct_geometry)
+    return mask, ct_geometry[1], ct_geometry[2]
 
-                rr, cc = np.meshgrid(np.arange(slices[0].Rows), np.arange(slices[0].Columns), indexing='ij')
-                poly = Path(np.vstack((col_coords, row_coords)).T)
-                coords = np.vstack((cc.flatten(), rr.flatten())).T
-                inside = poly.contains_points(coords)
 
-                mask_slice = inside.reshape((slices[0].Rows, slices[0].Columns))
-                mask[slice_idx][mask_slice] = 1
+def save_stl(vertices: np.ndarray, faces: np.ndarray, output_path: str) -> None:
+    """Grava uma malha triangular em um arquivo STL binário.
 
-    return mask, pixel_spacing, slice_thickness
+    Os triângulos são montados em um único vetor estruturado (normal, vértices e atributo)
+    e escritos no arquivo em uma única operação, sem empacotamento triângulo a triângulo.
 
-
-def mask_to_stl(mask: np.ndarray, pixel_spacing: list[float], slice_thickness: float, output_path: str) -> None:
+    Parâmetros:
+        vertices (np.ndarray): Vértices da malha (V, 3).
+        faces (np.ndarray): Índices dos vértices de cada triângulo (F, 3).
+        output_path (str): Caminho de saída do arquivo STL.
+    """
+    triangles = np.asarray(vertices, dtype=np.float32)[faces]
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+
+    records = np.zeros(len(faces), dtype=[('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attr', '<u2')])
+    records['normal'] = normals
+    records['vertices'] = triangles
+    with open(output_path, 'wb') as f:
+        f.write(b'\0' * 80)
+        np.array(len(faces), dtype='<u4').tofile(f)
+        records.tofile(f)
+
+
+def mask_to_stl(mask: np.ndarray, pixel_spacing: list[float], slice_thickness: float, output_path: str,
+                step_size: int = 1, offset: tuple[int, int, int] | None = None) -> None:
     """Gera um arquivo STL 3D a partir de uma máscara volumétrica binária.
 
     A superfície é reconstruída via o algoritmo Marching Cubes e centralizada
@@ -107,18 +336,161 @@ def mask_to_stl(mask: np.ndarray, pixel_spacing: list[float], slice_thickness: f
         pixel_spacing (list[float]): Espaçamento dos pixels [mm] em X e Y.
         slice_thickness (float): Espessura dos cortes (mm).
         output_path (str): Caminho de saída do arquivo STL.
+        step_size (int): Passo do Marching Cubes em voxels; valores maiores geram malhas
+            mais grosseiras, com menos triângulos e em menos tempo (padrão: 1).
+        offset (tuple[int, int, int] | None): Índice (fatia, linha, coluna) do voxel [0, 0, 0]
+            quando a máscara já é um recorte com margem (contours_to_mask com crop=True);
+            nesse caso o recorte abaixo não é refeito (padrão: None).
     """
-    verts, faces, normals, _ = measure.marching_cubes(
-        mask, level=0.5, spacing=(slice_thickness, pixel_spacing[0], pixel_spacing[1])
+    if offset is not None:
+        if not mask.any():
+            raise ValueError("A máscara da estrutura está vazia.")
+        z0, y0, x0 = offset
+    else:
+        # Recorte da máscara à caixa delimitadora da estrutura, com margem de 1 voxel
+        bounds = []
+        for axis in range(3):
+            occupied = np.flatnonzero(mask.any(axis=tuple(a for a in range(3) if a != axis)))
+            if occupied.size == 0:
+                raise ValueError("A máscara da estrutura está vazia.")
+            bounds.append((max(occupied[0] - 1, 0), min(occupied[-1] + 2, mask.shape[axis])))
+        (z0, z1), (y0, y1), (x0, x1) = bounds
+        mask = mask[z0:z1, y0:y1, x0:x1]
+
+    spacing = (slice_thickness, pixel_spacing[0], pixel_spacing[1])
+    verts, faces, _, _ = measure.marching_cubes(
+        mask, level=0.5, spacing=spacing, step_size=step_size, method='lewiner'
     )
+    # O STL binário armazena float32; a malha é mantida nessa precisão desde a origem
+    verts = verts.astype(np.float32, copy=False)
+    verts += np.array([z0, y0, x0], dtype=np.float32) * np.array(spacing, dtype=np.float32)
 
-    mesh = trimesh.Trimesh(vertices=verts, faces=faces, vertex_normals=normals)
-    mesh.apply_translation(-mesh.centroid)
-    mesh.export(output_path)
+    # Centralização pela média dos vértices (sem o centroide ponderado por área da malha)
+    verts -= verts.mean(axis=0)
+    save_stl(verts, faces, output_path)
 
-    print(f"✅ STL exportado para: {output_path}")
-    print(f"📏 Modelo centralizado no ponto (0,0,0)")
 
+def stitch_contours(contours: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray] | None:
+    """Monta a superfície de uma estrutura costurando os contornos de cortes adjacentes.
+
+    Cada par de cortes vizinhos é ligado por uma faixa de triângulos. Assim como na
+    reconstrução por Marching Cubes, o primeiro e o último contorno são estendidos em meia
+    espessura de corte e fechados por triangulação em leque.
+
+    A costura pela menor diagonal só gera uma superfície sem autointerseções quando os
+    contornos vizinhos são parecidos; por isso todos os contornos devem ser convexos e cada
+    par de cortes vizinhos deve ter áreas semelhantes e caixas delimitadoras sobrepostas.
+
+    Parâmetros:
+        contours (list[np.ndarray]): Contornos (N, 3) da estrutura em coordenadas do paciente (mm).
+
+    Retorna:
+        tuple[np.ndarray, np.ndarray] | None:
+            - Vértices (V, 3), na ordem de eixos (z, y, x) da máscara
+            - Triângulos (F, 3)
+            ou None quando a costura direta não se aplica (mais de um contorno por corte,
+            cortes não equiespaçados, contornos não convexos ou cortes vizinhos dissimilares).
+    """
+    if len(contours) < 2:
+        return None
+    contours = sorted(contours, key=lambda pts: pts[0, 2])
+    z_steps = np.diff([pts[0, 2] for pts in contours])
+    dz = z_steps[0]
+    if dz <= 0 or not np.allclose(z_steps, dz):
+        return None
+
+    # Contornos abertos (sem o ponto de fechamento repetido), convexos e em sentido anti-horário
+    rings, areas, boxes = [], [], []
+    for pts in contours:
+        if np.array_equal(pts[0], pts[-1]):
+            pts = pts[:-1]
+        if len(pts) < 3:
+            return None
+        x, y = pts[:, 0], pts[:, 1]
+        signed_area = (np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) / 2
+        if signed_area == 0:
+            return None
+        ring = pts if signed_area > 0 else pts[::-1]
+        edges = np.roll(ring[:, :2], -1, axis=0) - ring[:, :2]
+        turns = edges[:, 0] * np.roll(edges[:, 1], -1) - edges[:, 1] * np.roll(edges[:, 0], -1)
+        if turns.min() < -1e-3 * np.abs(turns).max():
+            return None
+        rings.append(ring)
+        areas.append(abs(signed_area))
+        boxes.append((x.min(), y.min(), x.max(), y.max()))
+
+    # Cortes vizinhos: áreas na razão de até 2 e caixas delimitadoras sobrepostas em pelo menos
+    # metade da menor delas
+    for k in range(len(rings) - 1):
+        if max(areas[k], areas[k + 1]) > 2 * min(areas[k], areas[k + 1]):
+            return None
+        (ax0, ay0, ax1, ay1), (bx0, by0, bx1, by1) = boxes[k], boxes[k + 1]
+        overlap = max(min(ax1, bx1) - max(ax0, bx0), 0) * max(min(ay1, by1) - max(ay0, by0), 0)
+        if overlap < 0.5 * min((ax1 - ax0) * (ay1 - ay0), (bx1 - bx0) * (by1 - by0)):
+            return None
+
+    rings = [rings[0] - [0.0, 0.0, dz / 2]] + rings + [rings[-1] + [0.0, 0.0, dz / 2]]
+    offsets = np.cumsum([0] + [len(ring) for ring in rings])
+
+    faces = []
+    for k in range(len(rings) - 1):
+        lower, upper = rings[k], rings[k + 1]
+        shift = np.argmin(np.sum((upper[:, :2] - lower[0, :2]) ** 2, axis=1))
+        upper_order = np.roll(np.arange(len(upper)), -shift)
+        band = _stitch_band(lower, upper[upper_order])
+        faces.append(np.concatenate((offsets[k] + np.arange(len(lower)), offsets[k + 1] + upper_order))[band])
+
+    # Tampas: normal para -z no contorno inferior e para +z no superior
+    fan = np.arange(1, len(rings[0]) - 1)
+    faces.append(offsets[0] + np.column_stack((np.zeros_like(fan), fan + 1, fan)))
+    fan = np.arange(1, len(rings[-1]) - 1)
+    faces.append(offsets[-2] + np.column_stack((np.zeros_like(fan), fan, fan + 1)))
+
+    verts = np.ascontiguousarray(np.concatenate(rings)[:, ::-1])
+    return verts, np.concatenate(faces)
+
+
+def contours_to_stl(rtstruct: pydicom.dataset.FileDataset, ct_folder: str, structure_name: str,
+                    output_path: str, step_size: int = 1) -> None:
+    """Gera um arquivo STL 3D de uma estrutura diretamente a partir dos seus contornos.
+
+    Os contornos fora da extensão da tomografia são descartados antes da escolha do caminho.
+    Quando a estrutura tem um único contorno por corte, a superfície é montada costurando
+    os contornos (stitch_contours), sem construir a máscara volumétrica. Nos demais casos
+    (ilhas, furos, cortes faltantes, contornos não convexos ou dissimilares, contornos que
+    ultrapassam a grade da imagem ou step_size maior que 1) é usado o caminho
+    contours_to_mask → mask_to_stl. Em ambos os casos o modelo é centralizado em (0,0,0).
+
+    Parâmetros:
+        rtstruct (FileDataset): Arquivo RTSTRUCT carregado.
+        ct_folder (str): Pasta contendo os arquivos DICOM das imagens de CT.
+        structure_name (str): Nome da estrutura (ROI) a ser exportada.
+        output_path (str): Caminho de saída do arquivo STL.
+        step_size (int): Passo do Marching Cubes; valores maiores que 1 sempre usam o
+            caminho por máscara (padrão: 1).
+    """
+    ct_geometry = read_ct_geometry(ct_folder)
+    contours = filter_contours_to_ct(get_structure_contours(rtstruct, structure_name), ct_geometry)
+
+    # A costura não recorta os contornos à grade da imagem, como faz a máscara; só é usada
+    # quando todos os contornos estão inteiramente dentro da imagem
+    _, pixel_spacing, _, (ox, oy), (rows, cols) = ct_geometry
+    x_max, y_max = ox + (cols - 1) * float(pixel_spacing[0]), oy + (rows - 1) * float(pixel_spacing[1])
+    inside_image = all(
+        pts[:, 0].min() >= ox and pts[:, 0].max() <= x_max and pts[:, 1].min() >= oy and pts[:, 1].max() <= y_max
+        for pts in contours
+    )
+    surface = stitch_contours(contours) if inside_image and step_size == 1 else None
+    if surface is None:
+        mask, offset = contours_to_mask(contours, ct_geometry, crop=True)
+        mask_to_stl(mask, ct_geometry[1], ct_geometry[2], output_path, step_size, offset)
+    else:
+        verts, faces = surface
+        verts -= verts.mean(axis=0)
+        save_stl(verts, faces, output_path)
+
+    print(f"✅ STL exportado para: {output_path}")
+    print("📏 Modelo centralizado no ponto (0,0,0)")
 
 
 def main():
@@ -129,8 +501,7 @@ def main():
     output_stl = f"{structure_name}.stl"
 
     rtstruct = load_rtstruct(rtstruct_path)
-    mask, spacing, dz = extract_structure_mask(rtstruct, ct_folder, structure_name)
-    mask_to_stl(mask, spacing, dz, output_stl)
+    contours_to_stl(rtstruct, ct_folder, structure_name, output_stl)
 
 
 if __name__ == "__main__":